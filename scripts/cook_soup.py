@@ -18,13 +18,56 @@ Also performs automated risk assessment for each dependency:
       >=4 => High
 """
 
+import asyncio
+import itertools
 import json
+import operator
 import os
 import re
-import urllib.request
-import urllib.error
-import urllib.parse
-from datetime import datetime, timezone
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+import aiohttp
+import ijson
+import orjson
+
+# Matches GitHub repository URLs, capturing (owner, repo)
+GITHUB_REPO_RE = re.compile(r"(?:https?:\/\/)?(?:www\.)?github\.com\/([^\/]+)\/([^\/]+)")
+MAJOR_VERSION_RE = re.compile(r"(\d+)\.")
+LEADING_DIGITS_RE = re.compile(r"\d+")
+PEP503_SEPARATORS_RE = re.compile(r"[-_.]+")
+
+# Pre-release versions: semver '1.0.0-rc.1' or PEP 440 '1.0rc1', '2.0b1', '1.0.dev0'
+PRERELEASE_RE = re.compile(r"v?\d+(?:\.\d+)*(?:-|[._]?(?:a|b|c|rc|alpha|beta|pre|preview|dev)\d*)", re.IGNORECASE)
+
+# A single constraint from a GitHub advisory vulnerableVersionRange, e.g. '< 4.17.21'
+VERSION_CONSTRAINT_RE = re.compile(r"^\s*(<=|>=|<|>|=)?\s*(\S+)\s*$")
+VERSION_OPERATORS = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "=": operator.eq,
+}
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_API_HEADERS = {"Accept": "application/vnd.github+json"}
+
+# Max number of in-flight GitHub API requests (keeps us under secondary rate limits)
+GITHUB_API_CONCURRENCY = 10
+
+# Rotate away from a token once it has fewer than this many requests left
+RATE_LIMIT_LOW_WATERMARK = 10
+
+# How many times a rate-limited request is retried before giving up
+RATE_LIMIT_MAX_RETRIES = 5
+
+# Packages per GraphQL advisory query (keeps each query well under GitHub's node limit)
+GRAPHQL_BATCH_SIZE = 100
+
+# On-disk cache of GitHub API responses, and how long a cached response is trusted without revalidation
+CACHE_PATH = ".soup_cache.sqlite"
+CACHE_TTL_SECONDS = 24 * 60 * 60
 
 
 class License:
@@ -36,6 +79,8 @@ class License:
       - is_non_commercial_only: bool
         Does the license prohibit commercial use?
     """
+    __slots__ = ("requires_license_file", "is_non_commercial_only")
+
     def __init__(
         self, 
         requires_license_file: bool, 
@@ -44,6 +89,26 @@ class License:
         self.requires_license_file = requires_license_file
         self.is_non_commercial_only = is_non_commercial_only
 
+
+@dataclass(slots=True)
+class Entry:
+    """
+    A single dependency from a license scanner output:
+      - name, version, url, license: as reported by the scanner (license normalized).
+      - ecosystem: GitHub Advisory Database ecosystem, "NPM" or "PIP".
+
+    risk_level, license_req and notes are filled in by main() before rendering.
+    """
+    name: str
+    version: str
+    url: str
+    license: str
+    ecosystem: str
+    risk_level: str = ""
+    license_req: str = ""
+    notes: str = ""
+
+
 # Dictionary mapping license identifiers to License class instances
 LICENSE_MAPPING = {
     "apache-2.0":    License(requires_license_file=True,  is_non_commercial_only=False),
@@ -91,186 +156,503 @@ def normalize_license(license_str: str) -> str:
 def process_poetry_licenses(file_path):
     """
     Read and parse the JSON output from `pip-licenses` for Poetry-based Python projects.
+    The file is stream-parsed, so only one package is held in memory at a time.
     
     :param file_path: Path to `licenses-poetry.json`.
-    :return: List of dicts with keys: name, version, url, license.
+    :return: List of Entry objects.
     """
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
     results = []
-    for item in data:
-        normalized = normalize_license(item.get("License", ""))
-        results.append({
-            "name": item.get("Name", "Unknown"),
-            "version": item.get("Version", "Unknown"),
-            "url": item.get("URL", ""),
-            "license": normalized
-        })
+    with open(file_path, "rb") as f:
+        for item in ijson.items(f, "item"):
+            normalized = normalize_license(item.get("License", ""))
+            results.append(Entry(
+                name=item.get("Name", "Unknown"),
+                version=item.get("Version", "Unknown"),
+                url=item.get("URL", ""),
+                license=normalized,
+                ecosystem="PIP",
+            ))
     return results
 
 
 def process_npm_licenses(file_path):
     """
     Read and parse the JSON output from `license-checker` for npm-based projects.
+    The file is stream-parsed, so only one package is held in memory at a time.
     
     :param file_path: Path to `licenses-npm.json`.
-    :return: List of dicts, each with keys: name, version, url, license.
+    :return: List of Entry objects.
     """
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
     results = []
-    for package_key, info in data.items():
-        # package_key often looks like "react@17.0.2"
-        if "@" in package_key:
-            name, version = package_key.rsplit("@", 1)
-        else:
-            name = package_key
-            version = "unknown"
-
-        license_str = info.get("licenses", "")
-        if isinstance(license_str, list) and license_str:
-            license_str = license_str[0]
-
-        normalized = normalize_license(license_str)
-        url = info.get("repository") or info.get("url") or ""
-        results.append({
-            "name": name,
-            "version": version,
-            "url": url,
-            "license": normalized
-        })
+    with open(file_path, "rb") as f:
+        for package_key, info in ijson.kvitems(f, ""):
+            # package_key often looks like "react@17.0.2"
+            if "@" in package_key:
+                name, version = package_key.rsplit("@", 1)
+            else:
+                name = package_key
+                version = "unknown"
+
+            license_str = info.get("licenses", "")
+            if isinstance(license_str, list) and license_str:
+                license_str = license_str[0]
+
+            normalized = normalize_license(license_str)
+            url = info.get("repository") or info.get("url") or ""
+            results.append(Entry(
+                name=name,
+                version=version,
+                url=url,
+                license=normalized,
+                ecosystem="NPM",
+            ))
     return results
 
 
-def parse_maintainer_from_url(repo_url):
+def parse_github_repo(repo_url):
     """
-    Parse the maintainer (owner) from a GitHub repository URL.
-    E.g. 'https://github.com/apache/commons-lang' => 'apache'
-    
-    If it doesn't match the standard pattern, returns ''.
+    Parse the (owner, repo) pair from a GitHub repository URL.
+    E.g. 'https://github.com/apache/commons-lang' => ('apache', 'commons-lang')
+
+    If it isn't a GitHub URL, returns None.
+    """
+    match = GITHUB_REPO_RE.search(repo_url)
+    if not match:
+        return None
+
+    return match.group(1), match.group(2).removesuffix(".git")
+
+
+def version_key(ver_str):
+    """
+    Turn a version string into a comparable tuple of ints, e.g. 'v4.17.21' => (4, 17, 21).
+    Pre-release and build suffixes are ignored, and trailing zeros dropped so '2.0' == '2.0.0'.
+    """
+    release = ver_str.strip().lstrip("v").split("-")[0].split("+")[0]
+    key = [int(match.group()) if (match := LEADING_DIGITS_RE.match(part)) else 0 for part in release.split(".")]
+    while key and key[-1] == 0:
+        key.pop()
+    return tuple(key)
+
+
+def is_version_in_range(version, vulnerable_range):
+    """
+    Check a version against a GitHub advisory range such as '>= 4.0.0, < 4.17.21' or '= 1.2.3'.
+    A version we can't parse (e.g. 'unknown') is treated as affected, since it can't be ruled out.
+
+    version_key ignores pre-release tags, so an installed pre-release (e.g. '1.0.0-rc.1')
+    whose release numbers equal a bound is ranked just below that bound. This errs
+    toward "affected" for '< 1.0.0' and '< 2.0.0-beta.5' alike.
+    """
+    if not LEADING_DIGITS_RE.search(version):
+        return True
+
+    # Second element: 0 for an installed pre-release, 1 otherwise (bounds always get 1)
+    key = (version_key(version), 0 if PRERELEASE_RE.match(version.strip()) else 1)
+    for constraint in vulnerable_range.split(","):
+        match = VERSION_CONSTRAINT_RE.match(constraint)
+        if not match:
+            return True
+        op, bound = match.groups()
+        if not VERSION_OPERATORS[op or "="](key, (version_key(bound), 1)):
+            return False
+    return True
+
+
+def advisory_package(entry):
+    """
+    The (ecosystem, name) key an entry is looked up under in the GitHub Advisory Database.
+    PIP names are normalized per PEP 503 (e.g. 'PyYAML' => 'pyyaml'), since pip-licenses
+    reports the display name; Entry.name itself is left unchanged.
+    """
+    if entry.ecosystem == "PIP":
+        return entry.ecosystem, PEP503_SEPARATORS_RE.sub("-", entry.name).lower()
+    return entry.ecosystem, entry.name
+
+
+def parse_major(ver_str):
+    """
+    Parse the major version number from a version string, e.g. 'v17.0.2' => 17.
+    Returns 0 if it can't be parsed.
+    """
+    ver_str = ver_str.lstrip("v")  # Remove leading 'v'
+    match = MAJOR_VERSION_RE.match(ver_str)
+    return int(match.group(1)) if match else 0
+
+
+class GitHubCache:
+    """
+    Persistent on-disk cache of GitHub API responses, keyed by URL.
+
+    Each row stores the response ETag, the raw JSON body and when it was fetched:
+      - Rows younger than CACHE_TTL_SECONDS are served without any HTTP call.
+      - Older rows are revalidated with `If-None-Match`; GitHub answers 304 Not Modified
+        for unchanged data, which doesn't count against the rate limit.
+      - 404s are stored as negative entries (no ETag, body `null`), so endpoints that
+        don't exist (e.g. /releases/latest on repos without releases) aren't re-requested
+        until the TTL expires.
+
+    Rows are also memoized in-process so a single run only reads each one from SQLite once.
+    """
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "url TEXT PRIMARY KEY, etag TEXT, body BLOB, fetched_at INTEGER)"
+        )
+        self._rows = {}
+
+    def get(self, url: str):
+        """
+        :return: (etag, body, fetched_at) tuple, or None if the URL isn't cached.
+        """
+        if url not in self._rows:
+            self._rows[url] = self.conn.execute(
+                "SELECT etag, body, fetched_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        return self._rows[url]
+
+    def put(self, url: str, etag, body: bytes):
+        """
+        Store (or refresh) the response for a URL, stamped with the current time.
+        """
+        row = (etag, body, int(time.time()))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses (url, etag, body, fetched_at) VALUES (?, ?, ?, ?)",
+            (url, *row),
+        )
+        self._rows[url] = row
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+class GitHubTokenPool:
+    """
+    Round-robin over one or more GitHub tokens, multiplying the per-token rate limit.
+
+    Tokens that are close to their rate limit (X-RateLimit-Remaining below
+    RATE_LIMIT_LOW_WATERMARK) are skipped until their X-RateLimit-Reset time,
+    as long as another token can take over; a lone token keeps being used until
+    it is actually exhausted. If every token is exhausted, we sleep until the
+    earliest reset.
+
+    GitHub keeps separate budgets per resource (X-RateLimit-Resource: "core" for
+    REST, "graphql" for GraphQL), so exhaustion is tracked per (token, resource).
+
+    With no tokens configured, requests are sent unauthenticated.
+    """
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self._cycle = itertools.cycle(tokens)
+        self._reset_at = {}  # (token, resource) -> epoch seconds when it becomes usable again
+
+    async def acquire(self, resource):
+        """
+        :param resource: Rate-limit bucket the request draws from, "core" or "graphql".
+        :return: The next token usable for that resource, or None if no tokens are configured.
+        """
+        if not self.tokens:
+            return None
+
+        while True:
+            now = time.time()
+            for _ in range(len(self.tokens)):
+                token = next(self._cycle)
+                if self._reset_at.get((token, resource), 0) <= now:
+                    return token
+            earliest_reset = min(self._reset_at[(token, resource)] for token in self.tokens)
+            await asyncio.sleep(max(earliest_reset - now, 1))
+
+    def update(self, token, resource, status, response_headers):
+        """
+        Record the rate-limit state GitHub reported for a token.
+        The bucket is taken from X-RateLimit-Resource, falling back to the requested resource.
+
+        A rate-limited 403 benches the token for at least a second, even if the reported
+        reset has already passed on our clock, so a retry never hammers the same token.
+        """
+        remaining = response_headers.get("X-RateLimit-Remaining")
+        reset = response_headers.get("X-RateLimit-Reset")
+        resource = response_headers.get("X-RateLimit-Resource", resource)
+        if not (token and remaining and reset):
+            return
+
+        if status == 403 and remaining == "0":
+            self._reset_at[(token, resource)] = max(int(reset), time.time() + 1)
+        elif int(remaining) < RATE_LIMIT_LOW_WATERMARK and self._has_spare_token(token, resource):
+            self._reset_at[(token, resource)] = int(reset)
+
+    def _has_spare_token(self, token, resource):
+        """
+        Whether another token in the pool can currently serve this resource.
+        """
+        now = time.time()
+        return any(
+            other != token and self._reset_at.get((other, resource), 0) <= now
+            for other in self.tokens
+        )
+
+
+def parse_github_tokens():
+    """
+    Read tokens from GITHUB_TOKEN plus the comma-separated GITHUB_TOKENS env var, deduplicated.
+    """
+    raw = f'{os.environ.get("GITHUB_TOKEN", "")},{os.environ.get("GITHUB_TOKENS", "")}'
+    return list(dict.fromkeys(token.strip() for token in raw.split(",") if token.strip()))
+
+
+GITHUB_TOKEN_POOL = GitHubTokenPool(parse_github_tokens())
+
+
+async def github_request(session, semaphore, method, url, headers, resource="core", **kwargs):
+    """
+    Send a request to the GitHub API and read its body.
+
+    The semaphore bounds how many requests are in flight at once, so we stay
+    clear of GitHub's secondary rate limits. Each request uses the next token
+    from GITHUB_TOKEN_POOL, and is retried (up to RATE_LIMIT_MAX_RETRIES times)
+    with another token if the current one hits its rate limit.
+
+    :param resource: Rate-limit bucket the request draws from, "core" (REST) or "graphql".
+    :return: (status, response headers, raw body) tuple.
+    :raises aiohttp.ClientResponseError: on 4xx/5xx responses, including a rate-limited
+                                         403 once the retries are used up.
+    """
+    for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+        token = await GITHUB_TOKEN_POOL.acquire(resource)
+        request_headers = {**headers, "Authorization": f"Bearer {token}"} if token else headers
+
+        async with semaphore:
+            async with session.request(
+                method, url, headers=request_headers, timeout=aiohttp.ClientTimeout(total=10), **kwargs
+            ) as resp:
+                GITHUB_TOKEN_POOL.update(token, resource, resp.status, resp.headers)
+                if (
+                    token and resp.status == 403
+                    and resp.headers.get("X-RateLimit-Remaining") == "0"
+                    and resp.headers.get("X-RateLimit-Reset")
+                    and attempt < RATE_LIMIT_MAX_RETRIES
+                ):
+                    # This token is out of requests; retry with the next one
+                    continue
+
+                resp.raise_for_status()
+                return resp.status, resp.headers, await resp.read()
+
+
+async def fetch_github_json(session, semaphore, cache, url):
     """
-    pattern = r"(?:https?:\/\/)?(?:www\.)?github\.com\/([^\/]+)\/([^\/]+)"
-    match = re.search(pattern, repo_url)
-    if match:
-        owner = match.group(1)
-        return owner
-    return ""
+    GET a GitHub API endpoint and decode its JSON body.
+
+    Successful responses are stored in the cache and revalidated with their
+    ETag on later runs. 404s are cached as a negative entry with the same TTL.
+
+    :return: The decoded JSON, or None if the endpoint returned 404.
+    :raises aiohttp.ClientResponseError: on other non-2xx responses.
+    """
+    headers = {}
+    cached = cache.get(url)
+    if cached:
+        etag, body, fetched_at = cached
+        if time.time() - fetched_at < CACHE_TTL_SECONDS:
+            return orjson.loads(body)
+        if etag:
+            headers["If-None-Match"] = etag
+
+    try:
+        status, resp_headers, resp_body = await github_request(session, semaphore, "GET", url, headers)
+    except aiohttp.ClientResponseError as e:
+        if e.status != 404:
+            raise
+        cache.put(url, None, b"null")
+        return None
+
+    if status == 304 and cached:
+        cache.put(url, etag, body)
+        return orjson.loads(body)
+
+    cache.put(url, resp_headers.get("ETag"), resp_body)
+    return orjson.loads(resp_body)
 
 
-def fetch_github_repo_info(owner, repo):
+async def fetch_package_advisories(session, semaphore, packages):
+    """
+    Fetch the vulnerable version ranges for each package from the GitHub Advisory Database.
+
+    Packages are checked in batches of GRAPHQL_BATCH_SIZE, one aliased
+    `securityVulnerabilities` lookup per package, so a whole SOUP only takes
+    a handful of GraphQL requests. The rare package with more than one page of
+    vulnerabilities gets follow-up requests for the remaining pages.
+
+    The GraphQL API requires a token. Packages that couldn't be checked (no
+    token, timeout, GraphQL error, ...) map to None and are reported on stderr,
+    so a failed lookup never silently reads as "no CVEs".
+
+    :param packages: List of unique (ecosystem, name) tuples, e.g. ("NPM", "react").
+    :return: dict mapping each package to a list of
+             {"vulnerableVersionRange": ..., "firstPatchedVersion": {"identifier": ...}} nodes, or None.
+    """
+    if not GITHUB_TOKEN_POOL.tokens:
+        if packages:
+            print("No GitHub token configured; skipping the CVE lookup.", file=sys.stderr)
+        return dict.fromkeys(packages)
+
+    async def query(lookups):
+        _, _, body = await github_request(
+            session, semaphore, "POST", f"{GITHUB_API_URL}/graphql", {},
+            resource="graphql", json={"query": f"{{\n{lookups}\n}}"},
+        )
+        result = orjson.loads(body)
+        if result.get("errors"):
+            raise RuntimeError(result["errors"][0].get("message", "GraphQL error"))
+        return result["data"]
+
+    def lookup(alias, package, after=None):
+        ecosystem, name = package
+        cursor = f", after: {json.dumps(after)}" if after else ""
+        return (
+            f"  {alias}: securityVulnerabilities(first: 100, ecosystem: {ecosystem}, package: {json.dumps(name)}{cursor}) "
+            "{ pageInfo { hasNextPage endCursor } nodes { vulnerableVersionRange firstPatchedVersion { identifier } } }"
+        )
+
+    async def fetch_batch(batch):
+        data = await query("\n".join(lookup(f"pkg{i}", package) for i, package in enumerate(batch)))
+
+        advisories = {}
+        for i, package in enumerate(batch):
+            page = data[f"pkg{i}"]
+            nodes = list(page["nodes"])
+            while page["pageInfo"]["hasNextPage"]:
+                page = (await query(lookup("pkg", package, page["pageInfo"]["endCursor"])))["pkg"]
+                nodes.extend(page["nodes"])
+            advisories[package] = nodes
+        return advisories
+
+    batches = [packages[i:i + GRAPHQL_BATCH_SIZE] for i in range(0, len(packages), GRAPHQL_BATCH_SIZE)]
+    results = await asyncio.gather(*map(fetch_batch, batches), return_exceptions=True)
+
+    advisories = {}
+    for batch, result in zip(batches, results):
+        if isinstance(result, BaseException):
+            print(f"CVE lookup failed for {len(batch)} packages: {result!r}", file=sys.stderr)
+            result = dict.fromkeys(batch)
+        advisories.update(result)
+    return advisories
+
+
+async def fetch_github_repo_info(session, semaphore, cache, owner, repo):
     """
     Enhanced to fetch:
       - stars
       - last_commit_date (pushed_at)
       - latest_version
+      - latest_major (parsed from latest_version)
       - open_issues_count
       - last_release_date
-      - has_known_cve (boolean)
 
+    Both endpoints are requested concurrently.
+
+    :param session: Shared aiohttp.ClientSession (sends GITHUB_API_HEADERS).
+    :param semaphore: asyncio.Semaphore bounding concurrent requests.
+    :param cache: GitHubCache for conditional requests.
     :param owner: GitHub owner/org.
     :param repo: GitHub repo name.
-    :return: dict with keys {stars, last_commit_date, latest_version, open_issues_count, last_release_date, has_known_cve}.
+    :return: dict with keys {stars, last_commit_date, latest_version, latest_major, open_issues_count, last_release_date}.
     """
-    api_token = os.environ.get("GITHUB_TOKEN", "")
-    headers = {"Accept": "application/vnd.github+json"}
-    if api_token:
-        headers["Authorization"] = f"Bearer {api_token}"
-
-    base_repo_api_url = f"https://api.github.com/repos/{owner}/{repo}"
+    base_repo_api_url = f"{GITHUB_API_URL}/repos/{owner}/{repo}"
 
     # Default values
     result = {
         "stars": 0,
         "last_commit_date": None,
         "latest_version": None,
+        "latest_major": None,
         "open_issues_count": 0,
         "last_release_date": None,
-        "has_known_cve": False
     }
 
-    # ---------------------------
-    # 1) Basic repo info
-    #    (includes stars, open_issues_count, pushed_at)
-    # ---------------------------
-    try:
-        req = urllib.request.Request(base_repo_api_url, headers=headers)
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-            result["stars"] = data.get("stargazers_count", 0)
-            result["open_issues_count"] = data.get("open_issues_count", 0)
-            pushed_at = data.get("pushed_at", "")
-            
-            if pushed_at:
-                result["last_commit_date"] = datetime.fromisoformat(pushed_at.replace("Z", "+00:00"))
-
-    except Exception:
-        pass
-
-    # ---------------------------
-    # 2) Latest release info (tag_name, published_at)
-    # ---------------------------
-    releases_api_url = f"{base_repo_api_url}/releases/latest"
-    try:
-        req = urllib.request.Request(releases_api_url, headers=headers)
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-            result["latest_version"] = data.get("tag_name")
-            published_at = data.get("published_at", "")
-            
-            if published_at:
-                last_release_date = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
-                result["last_release_date"] = last_release_date
-
-    except urllib.error.HTTPError as e:
-        if e.code != 404:
-            pass
-
-    except Exception:
-        pass
-
-    # ---------------------------
-    # 3) Check for known CVEs or CWEs via GitHub Security Advisories
-    #    (Very simplified approach!)
-    # ---------------------------
-    advisories_url = f"https://api.github.com/repos/{owner}/{repo}/security/advisories"
-    try:
-        req = urllib.request.Request(advisories_url, headers=headers)
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            advisories_data = json.loads(resp.read().decode("utf-8"))
-            
-            # If there's any published advisory, we'll set has_known_cve = True
-            if isinstance(advisories_data, list) and len(advisories_data) > 0:
-                result["has_known_cve"] = True
-
-    except urllib.error.HTTPError as e:
-        # If it's 404 or 403, we assume no advisories or no access
-        pass
-    
-    except Exception:
-        pass
+    repo_data, release_data = await asyncio.gather(
+        # 1) Basic repo info (includes stars, open_issues_count, pushed_at)
+        fetch_github_json(session, semaphore, cache, base_repo_api_url),
+        # 2) Latest release info (tag_name, published_at)
+        fetch_github_json(session, semaphore, cache, f"{base_repo_api_url}/releases/latest"),
+        return_exceptions=True,
+    )
+
+    # Any failed request (404, 403, timeout, ...) simply leaves the defaults in place.
+    if isinstance(repo_data, dict):
+        result["stars"] = repo_data.get("stargazers_count", 0)
+        result["open_issues_count"] = repo_data.get("open_issues_count", 0)
+        pushed_at = repo_data.get("pushed_at", "")
+
+        if pushed_at:
+            result["last_commit_date"] = date.fromisoformat(pushed_at[:10])
+
+    if isinstance(release_data, dict):
+        result["latest_version"] = release_data.get("tag_name")
+        if result["latest_version"]:
+            result["latest_major"] = parse_major(result["latest_version"])
+        published_at = release_data.get("published_at", "")
+
+        if published_at:
+            result["last_release_date"] = date.fromisoformat(published_at[:10])
 
     return result
 
 
-def is_significantly_older(local_version, latest_version):
+async def fetch_all_repo_info(github_entries):
     """
-    Determine if local_version is >=1 major versions behind the latest_version using a simple major comparison.
+    Fetch GitHub metadata for every GitHub-hosted entry concurrently over a single session.
+
+    Many packages share a repository (e.g. monorepos like babel/babel), so each
+    unique (owner, repo) pair is only fetched once. Known CVEs are looked up per
+    package through the batched GraphQL advisory query, and only count if the
+    version we depend on falls inside a vulnerable range.
+
+    :param github_entries: List of (Entry, (owner, repo)) pairs.
+    :return: List aligned with `github_entries`; each item is the dict from
+             fetch_github_repo_info plus:
+               - has_known_cve: True/False, or None if the CVE lookup failed.
+               - cve_patched_version: Highest first-patched version among the matching
+                 vulnerabilities, or None.
     """
-    def parse_major(ver_str):
-        ver_str = ver_str.lstrip("v")  # Remove leading 'v'
-        match = re.match(r"(\d+)\.", ver_str)
-        return int(match.group(1)) if match else 0
+    unique_repos = list(dict.fromkeys(repo for _, repo in github_entries))
+    packages = list(dict.fromkeys(advisory_package(entry) for entry, _ in github_entries))
 
-    if not local_version or not latest_version:
-        return False
-    local_major = parse_major(local_version)
-    latest_major = parse_major(latest_version)
-    return (latest_major - local_major) >= 1
+    semaphore = asyncio.Semaphore(GITHUB_API_CONCURRENCY)
+    cache = GitHubCache(CACHE_PATH)
 
+    # One pooled session, so requests reuse keep-alive connections instead of
+    # paying a TCP + TLS handshake each. Common headers are set once here.
+    connector = aiohttp.TCPConnector(limit_per_host=GITHUB_API_CONCURRENCY)
+    try:
+        async with aiohttp.ClientSession(headers=GITHUB_API_HEADERS, connector=connector) as session:
+            advisories, *infos = await asyncio.gather(
+                fetch_package_advisories(session, semaphore, packages),
+                *(fetch_github_repo_info(session, semaphore, cache, *repo) for repo in unique_repos),
+            )
+    finally:
+        cache.close()
+
+    info_by_repo = dict(zip(unique_repos, infos))
+    results = []
+    for entry, repo in github_entries:
+        info = {**info_by_repo[repo], "has_known_cve": None, "cve_patched_version": None}
+
+        nodes = advisories.get(advisory_package(entry))
+        if nodes is not None:
+            matching = [node for node in nodes if is_version_in_range(entry.version, node["vulnerableVersionRange"])]
+            patched = [node["firstPatchedVersion"]["identifier"] for node in matching if node["firstPatchedVersion"]]
+            info["has_known_cve"] = bool(matching)
+            info["cve_patched_version"] = max(patched, key=version_key, default=None)
+
+        results.append(info)
+    return results
 
-def assess_risk(repo_url, local_version):
+
+def assess_risk(info, local_version, today):
     """
     Weighted scoring approach with additional factors:
       1) Infrequent Commits (>1 year) => 1 point
@@ -284,24 +666,17 @@ def assess_risk(repo_url, local_version):
       0 => Low
       1-3 => Medium
       >=4 => High
-    """
-    owner = parse_maintainer_from_url(repo_url)
-    if not owner:
-        return ("Low", "")  # Not a GitHub URL => skip
-
-    match = re.search(r"github\.com/([^/]+)/([^/]+)", repo_url)
-    if not match:
-        return ("Low", "")
-
-    repo_name = match.group(2).rstrip(".git")
-    info = fetch_github_repo_info(owner, repo_name)
 
+    :param info: dict from fetch_all_repo_info.
+    :param local_version: The version we depend on.
+    :param today: Today's date, shared across all entries.
+    """
     score = 0
     notes_list = []
 
     # (1) Infrequent Commits
     if info["last_commit_date"]:
-        days_since_push = (datetime.now(timezone.utc) - info["last_commit_date"]).days
+        days_since_push = (today - info["last_commit_date"]).days
         if days_since_push > 365:
             score += 1
             notes_list.append("Infrequent Commits")
@@ -311,22 +686,22 @@ def assess_risk(repo_url, local_version):
         score += 2
         notes_list.append("Low Popularity")
 
-    # (3) Significantly Older Version
-    if is_significantly_older(local_version, info["latest_version"]):
+    # (3) Significantly Older Version (>=1 major version behind the latest release)
+    latest_major = info["latest_major"]
+    if local_version and latest_major is not None and latest_major - parse_major(local_version) >= 1:
         score += 2
         notes_list.append("Version Behind Latest")
 
     # (4) Excessive Open Issues
-    #    A naive ratio: open_issues_count * 100 / max(stars, 1).
-    issues_per_100_stars = info["open_issues_count"] * 100 / max(info["stars"], 1)
-    # Example threshold: If ratio > 50 => "Excessive Open Issues" 
-    if issues_per_100_stars > 50:
+    #    A naive ratio: more than 50 open issues per 100 stars => "Excessive Open Issues".
+    #    Compared in integers: open_issues * 100 / stars > 50  <=>  open_issues * 2 > stars.
+    if info["open_issues_count"] * 2 > max(info["stars"], 1):
         score += 1
         notes_list.append("Excessive Open Issues")
 
     # (5) Last Release Date > 2 years
     if info["last_release_date"]:
-        days_since_release = (datetime.now(timezone.utc) - info["last_release_date"]).days
+        days_since_release = (today - info["last_release_date"]).days
         if days_since_release > 730:
             score += 1
             notes_list.append("Stale Release (>2y)")
@@ -334,7 +709,12 @@ def assess_risk(repo_url, local_version):
     # (6) Open CVE / CWEs
     if info["has_known_cve"]:
         score += 3
-        notes_list.append("Known CVE/CWEs")
+        if info["cve_patched_version"]:
+            notes_list.append(f"Known CVE/CWEs (patched in {info['cve_patched_version']})")
+        else:
+            notes_list.append("Known CVE/CWEs")
+    elif info["has_known_cve"] is None:
+        notes_list.append("CVE Lookup Failed")
 
     # Determine risk
     if score <= 1:
@@ -348,6 +728,16 @@ def assess_risk(repo_url, local_version):
     return (risk_level, notes)
 
 
+# Markdown table for SOUP.md; each Entry is rendered through TABLE_ROW_FORMAT
+TABLE_HEADER = (
+    "| Risk Level | Component Name | Version | License | License Requirements | Notes | GitHub Repo URL |\n"
+    "|------------|---------------|---------|---------|----------------------|-------|-----------------|"
+)
+TABLE_ROW_FORMAT = (
+    "| {0.risk_level} | {0.name} | {0.version} | {0.license} | {0.license_req} | {0.notes} | {0.url} |"
+)
+
+
 def main():
     """
     Main entry: checks for JSON files, merges results, deduplicates, writes 'SOUP.md'.
@@ -364,58 +754,52 @@ def main():
     # Deduplicate by (name, version, license)
     unique_map = {}
     for e in entries:
-        key = (e["name"], e["version"], e["license"])
-        if key not in unique_map:
-            unique_map[key] = e
+        unique_map.setdefault((e.name, e.version, e.license), e)
     final_entries = list(unique_map.values())
 
-    # Enrich each entry with license requirements, risk level, and notes
+    # Enrich each entry with license requirements. Risk levels that don't need
+    # the GitHub API are settled here, so only GitHub repos are fetched below.
+    github_entries = []
     for entry in final_entries:
-        license_obj = get_license_object(entry["license"])
-        license_req = "Include License File" if license_obj.requires_license_file else "No License File Required"
+        license_obj = get_license_object(entry.license)
+        entry.license_req = "Include License File" if license_obj.requires_license_file else "No License File Required"
         if license_obj.is_non_commercial_only:
-            license_req += ", NON-COMMERCIAL USE ONLY"
+            entry.license_req += ", NON-COMMERCIAL USE ONLY"
 
-        risk_level, notes = assess_risk(entry["url"], entry["version"])
+        github_repo = parse_github_repo(entry.url)
 
         # If it's an unknown license, manual review is required
-        if entry["license"] == "unknown":
-            risk_level = "High"
-            notes = "Unknown License, Manual Review Required"
+        if entry.license == "unknown":
+            entry.risk_level = "High"
+            entry.notes = "Unknown License, Manual Review Required"
+        elif github_repo:
+            github_entries.append((entry, github_repo))
+        else:
+            entry.risk_level = "Low"  # Not a GitHub URL => skip
 
-        entry["risk_level"] = risk_level
-        entry["license_req"] = license_req
-        entry["notes"] = notes
+    # Fetch GitHub metadata for the remaining entries concurrently, and assess their risk
+    repo_infos = asyncio.run(fetch_all_repo_info(github_entries))
+    today = date.today()
+    for (entry, _), info in zip(github_entries, repo_infos):
+        entry.risk_level, entry.notes = assess_risk(info, entry.version, today)
 
     # Custom sort by Risk Level then by component name
     risk_priority = {"High": 1, "Medium": 2, "Low": 3}
     final_entries.sort(
-        key=lambda e: (risk_priority.get(e["risk_level"], 999), e["name"].lower())
+        key=lambda e: (risk_priority.get(e.risk_level, 999), e.name.lower())
     )
 
-    # Time to append the data to SOUP.md
-    md_lines = []
-    md_lines.append("| Risk Level | Component Name | Version | License | License Requirements | Notes | GitHub Repo URL |")
-    md_lines.append("|------------|---------------|---------|---------|----------------------|-------|-----------------|")
-
-    for entry in final_entries:
-        md_lines.append(
-            f"| {entry['risk_level']} "
-            f"| {entry['name']} "
-            f"| {entry['version']} "
-            f"| {entry['license']} "
-            f"| {entry['license_req']} "
-            f"| {entry['notes']} "
-            f"| {entry['url']} |"
-        )
-
-    # Load template and write it to a file
-    with open(".workflowsRepo/scripts/cook_soup_template.md", "r", encoding="utf-8") as soup_template:
-        template_content = soup_template.read()
+    # Load the template, then stream the table into SOUP.md in place of the placeholder
+    template = Path(".workflowsRepo/scripts/cook_soup_template.md").read_text(encoding="utf-8")
+    before_table, placeholder, after_table = template.partition("{{DEPENDENCY_TABLE}}")
 
-    final_content = template_content.replace("{{DEPENDENCY_TABLE}}", "\n".join(md_lines))
     with open("SOUP.md", "w", encoding="utf-8") as out_file:
-        out_file.write(final_content)
+        out_file.write(before_table)
+        if placeholder:
+            out_file.write(TABLE_HEADER)
+            for entry in final_entries:
+                out_file.write("\n" + TABLE_ROW_FORMAT.format(entry))
+        out_file.write(after_table)
 
 
 if __name__ == "__main__":